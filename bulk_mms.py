@@ -1,9 +1,18 @@
 import csv
+import functools
 import os
+import queue
+import random
+import re
+import threading
 import time
-from typing import Dict, List, Set, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from twilio.base.exceptions import TwilioRestException
+from twilio.http.http_client import TwilioHttpClient
 from twilio.rest import Client
 import phonenumbers
 
@@ -15,7 +24,14 @@ LOG_FILE = "send_log.csv"
 OPTOUT_FILE = "optouts.txt"        # optional; script will skip numbers listed here (one per line, E.164)
 
 DEFAULT_REGION = "US"
-SECONDS_BETWEEN_MESSAGES = 0.40    # throttle
+MAX_WORKERS = 8                    # concurrent sends in flight
+SEND_RATE_PER_SEC = 25             # token bucket refill rate (stay under Twilio account RPS)
+SEND_BURST = 125                   # token bucket capacity
+SEND_MAX_ATTEMPTS = 3              # per message, for 429/5xx only
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+LOG_BATCH_ROWS = 64                # send-log rows per writerows/flush
+LOG_FLUSH_SECONDS = 0.5            # ...or at least this often while rows are pending
+PROGRESS_EVERY = 100               # status line every N results (or once a second)
 DRY_RUN = False                   # set True to test without sending
 
 # Your message + media
@@ -29,19 +45,65 @@ IMAGE_URL = "https://i.imgur.com/xlpj9Ve.png"
 
 # =========================
 
+_LOG_DONE = object()
 
-def load_optouts(path: str) -> Set[str]:
-    if not os.path.exists(path):
-        return set()
-    with open(path, "r", encoding="utf-8") as f:
-        return {line.strip() for line in f if line.strip()}
+_E164 = phonenumbers.PhoneNumberFormat.E164
+_E164_RE = re.compile(r"^\+[1-9]\d{7,14}$")
+
+# phonenumbers loads region metadata lazily; pay that once at import, not on row 1
+phonenumbers.is_valid_number(phonenumbers.parse("+12025551234", None))
+
+# split once; a template without {name} is a single part and every body is that same string
+_TPL_PARTS = MESSAGE_TEMPLATE.split("{name}")
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = float(rate)
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def load_optouts(path: str) -> FrozenSet[str]:
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return frozenset()
+    # one read and one bulk split instead of Python-level line iteration
+    with open(path, "rb") as f:
+        lines = f.read().splitlines()
+    return frozenset(line.strip().decode("utf-8") for line in lines if line.strip())
 
 
 def normalize_e164(raw: str, default_region: str = DEFAULT_REGION) -> Optional[str]:
     raw = (raw or "").strip()
-    if not raw:
+    # cheap prefilter: nothing this short (or digit-free) can be a valid number
+    if len(raw) < 7 or not any(ch.isdigit() for ch in raw):
         return None
+    return _normalize_cached(raw, default_region)
+
+
+@functools.lru_cache(maxsize=None)
+def _normalize_cached(raw: str, default_region: str) -> Optional[str]:
     try:
+        # already E.164: the cheap length/prefix check is enough, skip full validation
+        if _E164_RE.match(raw):
+            parsed = phonenumbers.parse(raw, None)
+            if phonenumbers.is_possible_number(parsed):
+                return raw
+
         if raw.startswith("+"):
             parsed = phonenumbers.parse(raw, None)
         else:
@@ -50,49 +112,68 @@ def normalize_e164(raw: str, default_region: str = DEFAULT_REGION) -> Optional[s
         if not phonenumbers.is_valid_number(parsed):
             return None
 
-        return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+        return phonenumbers.format_number(parsed, _E164)
     except Exception:
         return None
 
 
-def load_contacts(csv_path: str) -> List[Dict[str, str]]:
+def load_contacts(csv_path: str) -> Tuple[List[str], List[str]]:
     if not os.path.exists(csv_path):
         raise FileNotFoundError(f"Missing {csv_path}. Create it with columns: phone,name")
 
-    contacts: List[Dict[str, str]] = []
-    seen: Set[str] = set()
-
-    with open(csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        if not reader.fieldnames or "phone" not in reader.fieldnames:
+    with open(csv_path, newline="", encoding="utf-8", buffering=1 << 20) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header or "phone" not in header:
             raise ValueError("contacts.csv must have a header row including at least: phone (and optionally name).")
 
-        for row in reader:
-            phone_raw = row.get("phone", "")
-            name = (row.get("name") or "").strip()
+        pi = header.index("phone")
+        ni = header.index("name") if "name" in header else -1
 
-            phone = normalize_e164(phone_raw)
-            if not phone:
-                continue
+        raw = [
+            (row[pi] if pi < len(row) else "", row[ni].strip() if 0 <= ni < len(row) else "")
+            for row in reader
+        ]
 
-            if phone in seen:
-                continue
-            seen.add(phone)
+    normalized = [normalize_e164(phone_raw) for phone_raw, _ in raw]
 
-            contacts.append({"phone": phone, "name": name})
+    # insertion-ordered; the first row for a phone wins
+    by_phone: Dict[str, str] = {}
+    for phone, (_, name) in zip(normalized, raw):
+        if phone:
+            by_phone.setdefault(phone, name)
 
-    return contacts
+    return list(by_phone), list(by_phone.values())
 
 
-def append_log(phone: str, name: str, status: str, sid_or_error: str) -> None:
-    file_exists = os.path.exists(LOG_FILE)
-    with open(LOG_FILE, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["phone", "name", "status", "sid_or_error"])
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(
-            {"phone": phone, "name": name, "status": status, "sid_or_error": sid_or_error}
-        )
+def open_log(path: str):
+    fp = open(path, "a", buffering=65536, newline="", encoding="utf-8")
+    writer = csv.writer(fp, quoting=csv.QUOTE_MINIMAL)
+    if fp.tell() == 0:
+        writer.writerow(["phone", "name", "status", "sid_or_error"])
+    return fp, writer
+
+
+def _drain_log(log_q: queue.Queue, writer, fp) -> None:
+    # single consumer: the only thread that touches the log file once sending starts
+    buf: List[List[str]] = []
+    last_flush = time.monotonic()
+    done = False
+    while not done:
+        try:
+            row = log_q.get(timeout=LOG_FLUSH_SECONDS)
+            if row is _LOG_DONE:
+                done = True
+            else:
+                buf.append(row)
+        except queue.Empty:
+            pass
+
+        if buf and (done or len(buf) >= LOG_BATCH_ROWS or time.monotonic() - last_flush >= LOG_FLUSH_SECONDS):
+            writer.writerows(buf)
+            fp.flush()
+            buf.clear()
+            last_flush = time.monotonic()
 
 
 def ensure_env() -> Dict[str, str]:
@@ -120,61 +201,116 @@ def ensure_env() -> Dict[str, str]:
     }
 
 
-def build_body(template: str, name: str) -> str:
-    safe_name = name if name else "there"
-    return template.replace("{name}", safe_name)
+def make_http_client() -> TwilioHttpClient:
+    # one keep-alive pool shared by all workers, sized so no worker waits on a socket
+    http_client = TwilioHttpClient(pool_connections=True)
+    http_client.session.mount(
+        "https://", HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS, max_retries=0)
+    )
+    return http_client
+
+
+def _send_one(create, msid: str, to_number: str, name: str, acquire, put_log) -> Tuple[str, str]:
+    # hot path: everything it needs is bound by the caller and passed in as locals
+    body = (name or "there").join(_TPL_PARTS)
+
+    if DRY_RUN:
+        put_log([to_number, name, "DRY_RUN", ""])
+        return "DRY_RUN", ""
+
+    attempt = 0
+    while True:
+        acquire()
+        try:
+            # IMPORTANT: For A2P 10DLC you must send via messaging_service_sid (MG...)
+            msg = create(
+                messaging_service_sid=msid,
+                to=to_number,
+                body=body,
+                #media_url=[IMAGE_URL],  # comment out to test SMS-only
+            )
+        except Exception as e:
+            attempt += 1
+            if (
+                isinstance(e, TwilioRestException)
+                and e.status in RETRY_STATUSES
+                and attempt < SEND_MAX_ATTEMPTS
+            ):
+                # exponential backoff with jitter; the retry also waits for a bucket token
+                time.sleep(min(2 ** (attempt - 1), 8) + random.random())
+                continue
+            put_log([to_number, name, "FAILED", str(e)])
+            return "FAILED", str(e)
+
+        put_log([to_number, name, "SENT", msg.sid])
+        return "SENT", msg.sid
 
 
 def send_bulk_mms() -> None:
     creds = ensure_env()
-    client = Client(creds["account_sid"], creds["auth_token"])
+    client = Client(creds["account_sid"], creds["auth_token"], http_client=make_http_client())
 
     optouts = load_optouts(OPTOUT_FILE)
-    contacts = load_contacts(CONTACTS_CSV)
+    phones, names = load_contacts(CONTACTS_CSV)
 
-    print(f"Contacts loaded: {len(contacts)}")
+    print(f"Contacts loaded: {len(phones)}")
     print(f"Opt-outs loaded: {len(optouts)}")
     print(f"DRY_RUN: {DRY_RUN}")
     print("Starting send...\n")
 
     sent = failed = skipped = 0
-
-    for i, c in enumerate(contacts, start=1):
-        to_number = c["phone"]
-        name = c["name"]
-
-        if to_number in optouts:
-            skipped += 1
-            append_log(to_number, name, "SKIPPED_OPTOUT", "")
-            print(f"[{i}/{len(contacts)}] SKIP (opt-out) -> {to_number}")
-            continue
-
-        body = build_body(MESSAGE_TEMPLATE, name)
-
-        if DRY_RUN:
-            sent += 1
-            append_log(to_number, name, "DRY_RUN", "")
-            print(f"[{i}/{len(contacts)}] DRY_RUN -> {to_number}")
-        else:
-            try:
-                # IMPORTANT: For A2P 10DLC you must send via messaging_service_sid (MG...)
-                msg = client.messages.create(
-                    messaging_service_sid=creds["messaging_service_sid"],
-                    to=to_number,
-                    body=body,
-                    #media_url=[IMAGE_URL],  # comment out to test SMS-only
-                )
-                sent += 1
-                append_log(to_number, name, "SENT", msg.sid)
-                print(f"[{i}/{len(contacts)}] SENT -> {to_number} (SID: {msg.sid})")
-            except Exception as e:
-                failed += 1
-                append_log(to_number, name, "FAILED", str(e))
-                print(f"[{i}/{len(contacts)}] FAILED -> {to_number}: {e}")
-
-        time.sleep(SECONDS_BETWEEN_MESSAGES)
-
-    print("\nDone.")
+    total = len(phones)
+    bucket = TokenBucket(SEND_RATE_PER_SEC, SEND_BURST)
+    log_fp, log_writer = open_log(LOG_FILE)
+
+    # opt-outs never reach the executor; log them in one batch up front
+    skipped_rows = [[p, n, "SKIPPED_OPTOUT", ""] for p, n in zip(phones, names) if p in optouts]
+    eligible = [(p, n) for p, n in zip(phones, names) if p not in optouts]
+    skipped = len(skipped_rows)
+    log_writer.writerows(skipped_rows)
+    if skipped:
+        print(f"Skipped {skipped} opted-out contact(s).")
+
+    log_q: queue.Queue = queue.Queue(maxsize=1024)
+    writer_thread = threading.Thread(target=_drain_log, args=(log_q, log_writer, log_fp), daemon=True)
+    writer_thread.start()
+
+    with log_fp:
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                create = client.messages.create
+                msid = creds["messaging_service_sid"]
+                futures = {
+                    executor.submit(_send_one, create, msid, p, n, bucket.acquire, log_q.put): p
+                    for p, n in eligible
+                }
+
+                last_print = time.monotonic()
+                try:
+                    for future in as_completed(futures):
+                        status, detail = future.result()
+                        if status == "FAILED":
+                            failed += 1
+                            # failures are rare; always show them
+                            print(f"\nFAILED -> {futures[future]}: {detail}")
+                        else:
+                            sent += 1
+                        i = sent + failed + skipped
+                        now = time.monotonic()
+                        if i % PROGRESS_EVERY == 0 or now - last_print >= 1.0 or i == total:
+                            print(f"\r[{i}/{total}] sent={sent} failed={failed} skipped={skipped}", end="")
+                            last_print = now
+                except BaseException:
+                    # Ctrl-C (or any error): drop the queued sends, let the in-flight ones finish
+                    print("\nAborting: cancelling queued sends...")
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise
+        finally:
+            # the pool has stopped (finished, or aborted with queued sends cancelled); drain the log
+            log_q.put(_LOG_DONE)
+            writer_thread.join()
+
+    print("\n\nDone.")
     print(f"Sent/Dry: {sent} | Failed: {failed} | Skipped: {skipped}")
     print(f"Log saved to: {LOG_FILE}")
 
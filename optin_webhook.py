@@ -1,10 +1,19 @@
+import atexit
 import csv
+import functools
+import gzip
+import hashlib
+import io
 import json
 import os
 import re
 import sqlite3
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, Iterator, Tuple
 
 from dotenv import load_dotenv
 from flask import (
@@ -13,45 +22,85 @@ from flask import (
     redirect,
     url_for,
     session,
-    render_template_string,
     jsonify,
     Response,
+    stream_with_context,
 )
+from markupsafe import escape
 import phonenumbers
 from twilio.twiml.messaging_response import MessagingResponse
 
+try:
+    import orjson
+    _json_loads = orjson.loads  # accepts str or bytes; errors subclass ValueError
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")  # str, so SQLite stores TEXT not BLOB
+except ImportError:  # optional speedup; stdlib json is fine
+    orjson = None
+    _json_loads = json.loads
+    _json_dumps = functools.partial(json.dumps, ensure_ascii=False)
+
 load_dotenv()
 
 app = Flask(__name__)
 app.secret_key = os.getenv("SECRET_KEY", "CHANGE_ME_PLEASE")
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 31536000  # static URLs carry a content-hash ?v=
 
 DEFAULT_REGION = os.getenv("DEFAULT_REGION", "US")
 DB_PATH = os.getenv("DB_PATH", "contacts.db")
 EXPORT_CSV = os.getenv("CONTACTS_CSV", "contacts.csv")
 OPTOUT_FILE = os.getenv("OPTOUT_FILE", "optouts.txt")
+EXPORT_DEBOUNCE_SECONDS = float(os.getenv("EXPORT_DEBOUNCE_SECONDS", "0.5"))
+CONTACTS_PAGE_SIZE = int(os.getenv("CONTACTS_PAGE_SIZE", "100"))
 
 ADMIN_USER = os.getenv("ADMIN_USER", "dad")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "")
 
-OPTIN_KEYWORDS = {"JOIN", "START", "SUBSCRIBE"}
-OPTOUT_KEYWORDS = {"STOP", "STOPALL", "UNSUBSCRIBE", "CANCEL", "END", "QUIT", "STOPA", "STOP1", "STOP2"}
-HELP_KEYWORDS = {"HELP", "INFO"}
+OPTIN_KEYWORDS = frozenset({"JOIN", "START", "SUBSCRIBE"})
+OPTOUT_KEYWORDS = frozenset({"STOP", "STOPALL", "UNSUBSCRIBE", "CANCEL", "END", "QUIT", "STOPA", "STOP1", "STOP2"})
+HELP_KEYWORDS = frozenset({"HELP", "INFO"})
+
+# one dict lookup per token; lower value wins, so STOP beats HELP beats JOIN in any word order
+KW_OPTOUT, KW_HELP, KW_OPTIN = 0, 1, 2
+KEYWORD_ACTION = {
+    **{k: KW_OPTIN for k in OPTIN_KEYWORDS},
+    **{k: KW_HELP for k in HELP_KEYWORDS},
+    **{k: KW_OPTOUT for k in OPTOUT_KEYWORDS},
+}
 
 ASK_NAME_ON_JOIN = True
 
+HAS_FTS = False  # set by init_search_index()
+
 
 # -------------------------
 # Helpers
 # -------------------------
+_utc_now_cache = (0, "")
+
+
 def utc_now() -> str:
-    # seconds only (cleaner + stable)
-    return datetime.utcnow().isoformat(timespec="seconds")
+    # seconds only (cleaner + stable); formatted once per second, swapped in as one tuple
+    global _utc_now_cache
+    now = int(time.time())
+    sec, text = _utc_now_cache
+    if sec != now:
+        text = datetime.fromtimestamp(now, tz=timezone.utc).replace(tzinfo=None).isoformat(timespec="seconds")
+        _utc_now_cache = (now, text)
+    return text
 
 
 def normalize_e164(raw: str, default_region: str = "US") -> Optional[str]:
     raw = (raw or "").strip()
-    if not raw:
+    # cheap prefilter: nothing this short (or digit-free) can be a valid number
+    if len(raw) < 7 or not any(ch.isdigit() for ch in raw):
         return None
+    return _normalize_cached(raw, default_region)
+
+
+@functools.lru_cache(maxsize=8192)
+def _normalize_cached(raw: str, default_region: str) -> Optional[str]:
     try:
         parsed = phonenumbers.parse(raw, None if raw.startswith("+") else default_region)
         if not phonenumbers.is_valid_number(parsed):
@@ -61,21 +110,68 @@ def normalize_e164(raw: str, default_region: str = "US") -> Optional[str]:
         return None
 
 
+_NAME_STRIP = re.compile(r"[^a-zA-Z\s'\-]")
+_WS = re.compile(r"\s+")
+
+
 def clean_name(s: str) -> str:
     s = (s or "").strip()
-    s = re.sub(r"[^a-zA-Z\s'\-]", "", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _NAME_STRIP.sub("", s)
+    s = _WS.sub(" ", s).strip()
     return s[:40]
 
 
+def esc(s: str) -> str:
+    # markupsafe's C escaper: one pass, and beats str.translate once the text has any non-ASCII
+    return str(escape(s))
+
+
+_local = threading.local()
+
+
 def db() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL;")
+    # one connection per worker thread, opened on first use and kept for the thread's lifetime
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=5.0)
+        conn.row_factory = sqlite3.Row
+        # WAL keeps contacts.db-wal / contacts.db-shm next to the database; back up all three together
+        conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA busy_timeout=5000;
+            PRAGMA cache_size=-20000;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=134217728;
+            PRAGMA foreign_keys=ON;
+            """
+        )
+        _local.conn = conn
     return conn
 
 
+@contextmanager
+def tx() -> Iterator[sqlite3.Connection]:
+    # take the write lock up front so read-check-write sequences can't interleave
+    conn = db()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+_inited = False
+
+
 def init_db() -> None:
+    # schema + FTS setup runs once per process; later calls are free
+    global _inited
+    if _inited:
+        return
     with db() as conn:
         conn.execute(
             """
@@ -99,20 +195,79 @@ def init_db() -> None:
                 before_json TEXT,
                 after_json TEXT,
                 ip TEXT,
-                created_at TEXT NOT NULL
+                created_at TEXT NOT NULL,
+                summary TEXT
             )
             """
         )
+        # databases created before the summary column; old rows keep NULL and are summarized on read
+        if "summary" not in {r["name"] for r in conn.execute("PRAGMA table_info(audit_log)")}:
+            conn.execute("ALTER TABLE audit_log ADD COLUMN summary TEXT")
+        # list/export pages sort by updated_at, optionally filtered by opted_out
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_contacts_updated ON contacts(updated_at DESC)")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_contacts_optout_updated ON contacts(opted_out, updated_at DESC)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_audit_contact_created ON audit_log(contact_id, created_at DESC)"
+        )
+        # refresh planner stats for any table that outgrew them (newer SQLite checks all tables here);
+        # the export worker runs a plain PRAGMA optimize after each export as the table grows
+        conn.execute("PRAGMA optimize=0x10002")
+    init_search_index()
+    _inited = True
+
+
+def init_search_index() -> None:
+    # trigram FTS5 keeps substring semantics (like LIKE '%q%') but answers from an index
+    global HAS_FTS
+    conn = db()
+    try:
+        existed = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='contacts_fts'"
+        ).fetchone()
+        conn.executescript(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+                phone, name, content='contacts', content_rowid='id', tokenize='trigram'
+            );
+            CREATE TRIGGER IF NOT EXISTS contacts_fts_ai AFTER INSERT ON contacts BEGIN
+                INSERT INTO contacts_fts(rowid, phone, name) VALUES (new.id, new.phone, new.name);
+            END;
+            CREATE TRIGGER IF NOT EXISTS contacts_fts_ad AFTER DELETE ON contacts BEGIN
+                INSERT INTO contacts_fts(contacts_fts, rowid, phone, name) VALUES ('delete', old.id, old.phone, old.name);
+            END;
+            CREATE TRIGGER IF NOT EXISTS contacts_fts_au AFTER UPDATE OF phone, name ON contacts BEGIN
+                INSERT INTO contacts_fts(contacts_fts, rowid, phone, name) VALUES ('delete', old.id, old.phone, old.name);
+                INSERT INTO contacts_fts(rowid, phone, name) VALUES (new.id, new.phone, new.name);
+            END;
+            """
+        )
+        if not existed:
+            with conn:
+                conn.execute("INSERT INTO contacts_fts(contacts_fts) VALUES ('rebuild')")
+        HAS_FTS = True
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5 / trigram (needs 3.34+): search falls back to LIKE
+        HAS_FTS = False
+
+
+# schema is created once per process, not on every query
+init_db()
 
 
 def admin_logged_in() -> bool:
     return session.get("admin_authed") is True
 
 
-def require_admin():
-    if not admin_logged_in():
-        return redirect(url_for("admin_login"))
-    return None
+def admin_required(view):
+    # checked before the view runs, so unauthenticated posts never parse a body or touch the DB
+    @functools.wraps(view)
+    def wrapped(*args, **kwargs):
+        if not admin_logged_in():
+            return redirect(url_for("admin_login"))
+        return view(*args, **kwargs)
+    return wrapped
 
 
 def current_actor() -> str:
@@ -124,176 +279,379 @@ def client_ip() -> str:
     return xff or (request.remote_addr or "")
 
 
-def audit_log(actor: str, action: str, contact_id: Optional[int], before: Optional[dict], after: Optional[dict]) -> None:
-    init_db()
-    with db() as conn:
-        conn.execute(
-            """
-            INSERT INTO audit_log (actor, action, contact_id, before_json, after_json, ip, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                actor,
-                action,
-                contact_id,
-                json.dumps(before, ensure_ascii=False) if before else None,
-                json.dumps(after, ensure_ascii=False) if after else None,
-                client_ip(),
-                utc_now(),
-            ),
+_AUDIT_FIELDS = ("phone", "name", "opted_out")
+
+
+def summarize_change(before: Optional[dict], after: Optional[dict]) -> str:
+    if after and not before:
+        return (
+            f"Created {after.get('phone','')}"
+            + (f" ({after.get('name','')})" if (after.get("name") or "").strip() else "")
+            + (" opted out" if after.get("opted_out") else "")
         )
+    if before and not after:
+        return f"Deleted {before.get('phone','')}" + (f" ({before.get('name','')})" if (before.get("name") or "").strip() else "")
+    if before and after:
+        changes = []
+        for k in _AUDIT_FIELDS:
+            bv, av = before.get(k), after.get(k)
+            if bv != av:
+                changes.append(f"{k}: {bv} → {av}")
+        return "; ".join(changes) if changes else "Updated"
+    return ""
+
+
+# one SQL string for every audit write so each connection's statement cache keeps hitting
+_AUDIT_INSERT_SQL = (
+    "INSERT INTO audit_log (actor, action, contact_id, before_json, after_json, ip, created_at, summary) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def audit_log(
+    actor: str,
+    action: str,
+    contact_id: Optional[int],
+    before: Optional[dict],
+    after: Optional[dict],
+    *,
+    conn: Optional[sqlite3.Connection] = None,
+) -> None:
+    # an edit that only bumped updated_at changed nothing worth recording
+    if action == "update" and before and after and all(
+        before.get(k) == v for k, v in after.items() if k != "updated_at"
+    ):
+        return
+    # pass conn to write the audit row inside the caller's transaction
+    params = (
+        actor,
+        action,
+        contact_id,
+        _json_dumps(before) if before else None,
+        _json_dumps(after) if after else None,
+        client_ip(),
+        utc_now(),
+        summarize_change(before, after),  # rendered once here, not on every audit page view
+    )
+    if conn is not None:
+        conn.execute(_AUDIT_INSERT_SQL, params)
+        return
+    with db() as c:
+        c.execute(_AUDIT_INSERT_SQL, params)
+
+
+_contacts_version = 0
+_counts_cache: Dict[str, Any] = {"version": -1, "at": 0.0, "counts": None}
+COUNTS_TTL_SECONDS = 2.0
+
+PHONE_CACHE_SIZE = 1024
+_phone_cache: "OrderedDict[str, Optional[dict]]" = OrderedDict()
+_phone_cache_lock = threading.Lock()
+
+
+def bump_contacts_version(*phones: str) -> None:
+    # called by every contacts mutation with the phone(s) it touched; invalidates caches
+    global _contacts_version
+    with _phone_cache_lock:
+        _contacts_version += 1
+        for phone in phones:
+            _phone_cache.pop(phone, None)
 
 
 def get_contact_by_phone(phone: str) -> Optional[dict]:
-    init_db()
-    with db() as conn:
+    with _phone_cache_lock:
+        if phone in _phone_cache:
+            _phone_cache.move_to_end(phone)
+            c = _phone_cache[phone]
+            return dict(c) if c else None
+        version = _contacts_version
+
+    row = db().execute(
+        "SELECT id, phone, name, opted_out, created_at, updated_at FROM contacts WHERE phone=?",
+        (phone,),
+    ).fetchone()
+    c = dict(row) if row else None
+
+    with _phone_cache_lock:
+        # a write that landed during the SELECT may have made this row stale; don't cache it
+        if version == _contacts_version:
+            _phone_cache[phone] = c
+            if len(_phone_cache) > PHONE_CACHE_SIZE:
+                _phone_cache.popitem(last=False)
+    return dict(c) if c else None
+
+
+def phone_exists_lite(phone: str) -> Optional[Tuple[int, str]]:
+    # typeahead path: (id, name) only; reuse a cached full row when there is one
+    with _phone_cache_lock:
+        if phone in _phone_cache:
+            c = _phone_cache[phone]
+            return (c["id"], c["name"]) if c else None
+
+    row = db().execute("SELECT id, name FROM contacts WHERE phone=? LIMIT 1", (phone,)).fetchone()
+    return (row[0], row[1]) if row else None
+
+
+def add_contact(phone: str, name: str = "", *, actor: str = "system", log: bool = True) -> bool:
+    now = utc_now()
+    with tx() as conn:
+        # an existing phone returns no row instead of raising and unwinding the transaction
         row = conn.execute(
-            "SELECT id, phone, name, opted_out, created_at, updated_at FROM contacts WHERE phone=?",
-            (phone,),
+            """
+            INSERT INTO contacts (phone, name, opted_out, created_at, updated_at)
+            VALUES (?, ?, 0, ?, ?)
+            ON CONFLICT(phone) DO NOTHING
+            RETURNING id, phone, name, opted_out, created_at, updated_at
+            """,
+            (phone, name, now, now),
         ).fetchone()
-        return dict(row) if row else None
+        if row is None:
+            # DO NOTHING still advances sqlite_sequence; roll back so duplicates don't burn ids
+            conn.rollback()
+            return False
+        if log:
+            after = dict(row)
+            audit_log(actor, "create", after["id"], None, after, conn=conn)
+    bump_contacts_version(phone)
+    return True
 
 
-def get_contact_by_id(contact_id: int) -> Optional[dict]:
-    init_db()
-    with db() as conn:
+def set_opted_out(phone: str, opted_out: int, *, actor: str = "system", log: bool = True) -> None:
+    with tx() as conn:
         row = conn.execute(
-            "SELECT id, phone, name, opted_out, created_at, updated_at FROM contacts WHERE id=?",
-            (contact_id,),
+            "SELECT id, phone, name, opted_out, created_at, updated_at FROM contacts WHERE phone=?",
+            (phone,),
+        ).fetchone()
+        before = dict(row) if row else None
+        row = conn.execute(
+            """
+            UPDATE contacts SET opted_out=?, updated_at=? WHERE phone=?
+            RETURNING id, phone, name, opted_out, created_at, updated_at
+            """,
+            (1 if opted_out else 0, utc_now(), phone),
         ).fetchone()
-        return dict(row) if row else None
+        after = dict(row) if row else None
+        if log and after:
+            audit_log(actor, "opt_out" if int(opted_out) == 1 else "opt_in", after.get("id"), before, after, conn=conn)
+    bump_contacts_version(phone)
 
 
-def add_contact(phone: str, name: str = "", *, actor: str = "system", log: bool = True) -> bool:
-    init_db()
+def upsert_opt_status(phone: str, opted_out: int, *, actor: str = "system") -> dict:
+    # keyword texts: create-or-flip in one transaction instead of add_contact + set_opted_out;
+    # always audited as opt_out/opt_in; a new contact's row just has no "before"
+    flag = 1 if opted_out else 0
     now = utc_now()
-    try:
-        with db() as conn:
-            conn.execute(
+    with tx() as conn:
+        row = conn.execute(
+            "SELECT id, phone, name, opted_out, created_at, updated_at FROM contacts WHERE phone=?",
+            (phone,),
+        ).fetchone()
+        before = dict(row) if row else None
+        # branch on the SELECT rather than ON CONFLICT DO UPDATE, which would burn an AUTOINCREMENT id
+        if before:
+            row = conn.execute(
+                """
+                UPDATE contacts SET opted_out=?, updated_at=? WHERE id=?
+                RETURNING id, phone, name, opted_out, created_at, updated_at
+                """,
+                (flag, now, before["id"]),
+            ).fetchone()
+        else:
+            row = conn.execute(
                 """
                 INSERT INTO contacts (phone, name, opted_out, created_at, updated_at)
-                VALUES (?, ?, 0, ?, ?)
+                VALUES (?, '', ?, ?, ?)
+                RETURNING id, phone, name, opted_out, created_at, updated_at
                 """,
-                (phone, name, now, now),
-            )
-        if log:
-            after = get_contact_by_phone(phone)
-            audit_log(actor, "create", after["id"] if after else None, None, after)
-        return True
-    except sqlite3.IntegrityError:
-        return False
-
-
-def set_opted_out(phone: str, opted_out: int, *, actor: str = "system", log: bool = True) -> None:
-    init_db()
-    before = get_contact_by_phone(phone)
-    with db() as conn:
-        conn.execute(
-            "UPDATE contacts SET opted_out=?, updated_at=? WHERE phone=?",
-            (1 if opted_out else 0, utc_now(), phone),
-        )
-    after = get_contact_by_phone(phone)
-    if log and after:
-        audit_log(actor, "opt_out" if int(opted_out) == 1 else "opt_in", after.get("id"), before, after)
+                (phone, flag, now, now),
+            ).fetchone()
+        after = dict(row)
+        audit_log(actor, "opt_out" if flag else "opt_in", after["id"], before, after, conn=conn)
+    bump_contacts_version(phone)
+    return after
 
 
 def delete_contact_by_id(contact_id: int, *, actor: str = "system", log: bool = True) -> bool:
-    init_db()
-    before = get_contact_by_id(contact_id)
-    if not before:
-        return False
-    with db() as conn:
-        conn.execute("DELETE FROM contacts WHERE id=?", (contact_id,))
-    if log:
-        audit_log(actor, "delete", contact_id, before, None)
+    with tx() as conn:
+        row = conn.execute(
+            """
+            DELETE FROM contacts WHERE id=?
+            RETURNING id, phone, name, opted_out, created_at, updated_at
+            """,
+            (contact_id,),
+        ).fetchone()
+        if not row:
+            return False
+        before = dict(row)
+        if log:
+            audit_log(actor, "delete", contact_id, before, None, conn=conn)
+    bump_contacts_version(before["phone"])
     return True
 
 
 def update_contact_by_id(contact_id: int, phone: str, name: str, opted_out: int, *, actor: str) -> dict:
-    init_db()
-    before = get_contact_by_id(contact_id)
-    if not before:
-        raise ValueError("Contact not found.")
+    with tx() as conn:
+        row = conn.execute(
+            "SELECT id, phone, name, opted_out, created_at, updated_at FROM contacts WHERE id=?",
+            (contact_id,),
+        ).fetchone()
+        if not row:
+            raise ValueError("Contact not found.")
+        before = dict(row)
 
-    if phone != before["phone"]:
-        existing = get_contact_by_phone(phone)
-        if existing and int(existing["id"]) != int(contact_id):
-            raise ValueError("That phone number already exists.")
+        if phone != before["phone"]:
+            existing = conn.execute("SELECT id FROM contacts WHERE phone=?", (phone,)).fetchone()
+            if existing and int(existing["id"]) != int(contact_id):
+                raise ValueError("That phone number already exists.")
 
-    with db() as conn:
-        conn.execute(
-            """
-            UPDATE contacts
-            SET phone=?, name=?, opted_out=?, updated_at=?
-            WHERE id=?
-            """,
-            (phone, name, 1 if opted_out else 0, utc_now(), contact_id),
+        after = dict(
+            conn.execute(
+                """
+                UPDATE contacts
+                SET phone=?, name=?, opted_out=?, updated_at=?
+                WHERE id=?
+                RETURNING id, phone, name, opted_out, created_at, updated_at
+                """,
+                (phone, name, 1 if opted_out else 0, utc_now(), contact_id),
+            ).fetchone()
         )
+        audit_log(actor, "update", contact_id, before, after, conn=conn)
 
-    after = get_contact_by_id(contact_id)
-    audit_log(actor, "update", contact_id, before, after)
+    bump_contacts_version(before["phone"], after["phone"])
     return after
 
 
-def list_contacts(q: str = "") -> List[Dict[str, Any]]:
-    init_db()
+def list_contacts_iter(q: str = "", *, limit: int = -1, offset: int = 0) -> Iterator[sqlite3.Row]:
+    # lazy cursor: callers that stream (CSV export) never hold the whole table in memory
+    # limit=-1 is SQLite for "no limit"
     q = (q or "").strip()
-    with db() as conn:
-        if q:
-            like = f"%{q}%"
-            rows = conn.execute(
-                """
-                SELECT id, phone, name, opted_out, created_at, updated_at
-                FROM contacts
-                WHERE phone LIKE ? OR name LIKE ?
-                ORDER BY updated_at DESC
-                """,
-                (like, like),
-            ).fetchall()
-        else:
-            rows = conn.execute(
-                """
-                SELECT id, phone, name, opted_out, created_at, updated_at
-                FROM contacts
-                ORDER BY updated_at DESC
-                """
-            ).fetchall()
-    return [dict(r) for r in rows]
+    conn = db()
+    if q and HAS_FTS and len(q) >= 3:
+        return conn.execute(
+            """
+            SELECT id, phone, name, opted_out, created_at, updated_at
+            FROM contacts
+            WHERE id IN (SELECT rowid FROM contacts_fts WHERE contacts_fts MATCH ?)
+            ORDER BY updated_at DESC
+            LIMIT ? OFFSET ?
+            """,
+            ('"' + q.replace('"', '""') + '"', limit, offset),
+        )
+    if q:
+        # trigram MATCH needs at least 3 characters
+        like = f"%{q}%"
+        return conn.execute(
+            """
+            SELECT id, phone, name, opted_out, created_at, updated_at
+            FROM contacts
+            WHERE phone LIKE ? OR name LIKE ?
+            ORDER BY updated_at DESC
+            LIMIT ? OFFSET ?
+            """,
+            (like, like, limit, offset),
+        )
+    return conn.execute(
+        """
+        SELECT id, phone, name, opted_out, created_at, updated_at
+        FROM contacts
+        ORDER BY updated_at DESC
+        LIMIT ? OFFSET ?
+        """,
+        (limit, offset),
+    )
 
 
 def get_counts() -> Dict[str, int]:
-    init_db()
-    with db() as conn:
-        total = conn.execute("SELECT COUNT(*) AS c FROM contacts").fetchone()["c"]
-        opted_in = conn.execute("SELECT COUNT(*) AS c FROM contacts WHERE opted_out=0").fetchone()["c"]
-        opted_out = conn.execute("SELECT COUNT(*) AS c FROM contacts WHERE opted_out=1").fetchone()["c"]
-    return {"total": int(total), "opted_in": int(opted_in), "opted_out": int(opted_out)}
+    now = time.monotonic()
+    cached = _counts_cache
+    if cached["version"] == _contacts_version and now - cached["at"] < COUNTS_TTL_SECONDS:
+        return cached["counts"]
+
+    version = _contacts_version
+    # grouped count walks the (opted_out, updated_at) index instead of the table
+    by_flag = dict(db().execute("SELECT opted_out, COUNT(*) FROM contacts GROUP BY opted_out").fetchall())
+    opted_in, opted_out = by_flag.get(0, 0), by_flag.get(1, 0)
+    counts = {"total": sum(by_flag.values()), "opted_in": opted_in, "opted_out": opted_out}
+    _counts_cache.update(version=version, at=now, counts=counts)
+    return counts
+
+
+_export_lock = threading.Lock()
 
 
 def export_contacts_csv_and_optouts() -> None:
-    init_db()
-    with db() as conn:
-        opted_in = conn.execute(
-            "SELECT phone, name FROM contacts WHERE opted_out=0 ORDER BY updated_at DESC"
-        ).fetchall()
-        opted_out = conn.execute(
-            "SELECT phone FROM contacts WHERE opted_out=1 ORDER BY updated_at DESC"
-        ).fetchall()
+    with _export_lock:
+        _write_exports()
+
+
+def _write_exports() -> None:
+    # write to a temp file and rename, so bulk_mms.py never reads a half-written export
+    conn = db()
+    cur = conn.cursor()
+    cur.row_factory = None  # plain tuples go straight into writerows
+    # one read transaction so both files come from the same snapshot
+    conn.execute("BEGIN")
+    try:
+        tmp = EXPORT_CSV + ".tmp"
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["phone", "name"])
+            w.writerows(cur.execute(
+                "SELECT phone, COALESCE(name, '') FROM contacts WHERE opted_out=0 ORDER BY updated_at DESC"
+            ))
+        os.replace(tmp, EXPORT_CSV)
+
+        tmp = OPTOUT_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(
+                row[0] + "\n"
+                for row in cur.execute("SELECT phone FROM contacts WHERE opted_out=1 ORDER BY updated_at DESC")
+            )
+        os.replace(tmp, OPTOUT_FILE)
+    finally:
+        conn.commit()
 
-    with open(EXPORT_CSV, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(["phone", "name"])
-        for row in opted_in:
-            w.writerow([row["phone"], row["name"] or ""])
 
-    with open(OPTOUT_FILE, "w", encoding="utf-8") as f:
-        for row in opted_out:
-            f.write(row["phone"] + "\n")
+_export_dirty = threading.Event()
 
 
-def tokens_upper(body: str) -> set:
+def schedule_export() -> None:
+    # request handlers only flag the export; the worker coalesces bursts into one write
+    _export_dirty.set()
+
+
+def _export_worker() -> None:
+    while True:
+        _export_dirty.wait()
+        time.sleep(EXPORT_DEBOUNCE_SECONDS)
+        _export_dirty.clear()
+        try:
+            export_contacts_csv_and_optouts()
+            # the export just scanned contacts on this connection, so optimize knows to re-ANALYZE it when stale
+            db().execute("PRAGMA optimize")
+        except Exception:
+            app.logger.exception("Contacts export failed.")
+
+
+@atexit.register
+def _flush_pending_export() -> None:
+    if _export_dirty.is_set():
+        export_contacts_csv_and_optouts()
+
+
+threading.Thread(target=_export_worker, name="contacts-export", daemon=True).start()
+
+
+_TOKEN_RE = re.compile(r"[A-Z0-9]+")
+
+
+def tokens_upper(body: str) -> Tuple[str, ...]:
     body = (body or "").strip().upper()
-    return set(body.split())
+    # most inbound texts are a single bare keyword; skip the regex for those
+    if body.isalnum():
+        return (body,)
+    # punctuation separates tokens too, so "Stop." and "help!" still match
+    return tuple(_TOKEN_RE.findall(body))
 
 
 # -------------------------
@@ -305,55 +663,7 @@ BASE_HTML = """
 <head>
   <title>{{ title }}</title>
   <meta name="viewport" content="width=device-width, initial-scale=1">
-  <style>
-    body{font-family:system-ui;margin:40px;max-width:1040px}
-    .card{border:1px solid #ddd;border-radius:14px;padding:18px}
-    input,select{padding:10px;margin:6px 0;border:1px solid #ccc;border-radius:10px;width:100%}
-    button{padding:10px 14px;border:0;border-radius:10px;background:#0b5fff;color:white;cursor:pointer}
-    .btn2{background:#555}
-    .btnGhost{background:#f2f3f5;color:#222}
-    .btnDanger{background:#b00020}
-    .ok{color:#0a7a2f;font-weight:700}
-    .err{color:#b00020;font-weight:700}
-    a{color:#0b5fff;text-decoration:none}
-    table{border-collapse:collapse;width:100%}
-    th,td{border:1px solid #ddd;padding:10px;text-align:left;vertical-align:top}
-    th{background:#f7f7f7}
-    .rowActions{white-space:nowrap}
-    .rowActions form{display:inline}
-    .pill{display:inline-block;padding:4px 10px;border-radius:999px;font-size:12px}
-    .in{background:#e9f7ef;color:#0a7a2f}
-    .out{background:#fdecea;color:#b00020}
-    .muted{color:#666}
-    .small{font-size:12px}
-    .badge{display:inline-block;padding:2px 10px;border-radius:999px;background:#eef2ff;color:#1e40af;font-weight:800;font-size:12px}
-    .kbd{font-family:ui-monospace, SFMono-Regular, Menlo, monospace;background:#f2f3f5;border-radius:8px;padding:2px 6px;font-size:12px}
-
-    .nav{display:flex;justify-content:space-between;align-items:center;margin-bottom:18px;padding-bottom:12px;border-bottom:1px solid #eee;gap:14px}
-    .navleft{display:flex;align-items:center;gap:14px;flex-wrap:wrap}
-    .navleft a{font-weight:700}
-    .navright{display:flex;align-items:center;gap:14px}
-
-    .searchRow{display:flex;gap:10px;align-items:center;margin:10px 0 18px}
-    .searchRow input{flex:1}
-
-    .actionsTop{display:flex;align-items:center;justify-content:space-between;gap:10px;flex-wrap:wrap;margin:10px 0 14px}
-
-    /* Inline edit */
-    .inlineField{display:none}
-    .editing .inlineView{display:none}
-    .editing .inlineField{display:block}
-    .miniInput{width:260px}
-    .miniSelect{width:180px}
-
-    /* Modal */
-    .modalOverlay{position:fixed;inset:0;background:rgba(0,0,0,.45);display:none;align-items:center;justify-content:center;z-index:9999;padding:16px}
-    .modal{background:white;border-radius:16px;max-width:520px;width:100%;border:1px solid #e5e7eb;box-shadow:0 20px 60px rgba(0,0,0,.25);padding:18px}
-    .modal h3{margin:0 0 6px}
-    .modal .row{display:flex;gap:10px;justify-content:flex-end;margin-top:14px}
-
-    .toast{position:fixed;bottom:16px;left:16px;background:#111827;color:white;padding:10px 12px;border-radius:12px;display:none;z-index:10000}
-  </style>
+  <link rel="stylesheet" href="/static/admin.css?v={{ css_version }}">
 </head>
 <body>
   {% if show_nav %}
@@ -375,25 +685,40 @@ BASE_HTML = """
 
   {{ body|safe }}
 
-  <script>
-    function showToast(msg){
-      const t = document.getElementById('toast');
-      if(!t) return;
-      t.textContent = msg;
-      t.style.display='block';
-      clearTimeout(window.__toastTimer);
-      window.__toastTimer = setTimeout(()=>{ t.style.display='none'; }, 2400);
-    }
-  </script>
+  <script src="/static/admin.js?v={{ js_version }}"></script>
 </body>
 </html>
 """
 
 
+_BASE_TMPL = app.jinja_env.from_string(BASE_HTML)
+
+
+def _static_version(filename: str) -> str:
+    # content hash for cache-busting the far-future-cached static files
+    with open(os.path.join(app.static_folder, filename), "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:10]
+
+
+CSS_VERSION = _static_version("admin.css")
+JS_VERSION = _static_version("admin.js")
+
+
+@app.after_request
+def _immutable_static(resp: Response) -> Response:
+    # a versioned URL never changes content, so browsers can skip revalidation entirely
+    if request.endpoint == "static" and request.args.get("v") and resp.status_code == 200:
+        resp.cache_control.immutable = True
+    return resp
+
+
 def render_admin(title: str, body: str, *, show_nav: bool = True) -> str:
     counts = get_counts() if show_nav else {"total": 0, "opted_in": 0, "opted_out": 0}
     actor = current_actor() if show_nav else ""
-    return render_template_string(BASE_HTML, title=title, body=body, show_nav=show_nav, counts=counts, actor=actor)
+    return _BASE_TMPL.render(
+        title=title, body=body, show_nav=show_nav, counts=counts, actor=actor,
+        css_version=CSS_VERSION, js_version=JS_VERSION,
+    )
 
 
 @app.route("/")
@@ -401,6 +726,23 @@ def home():
     return redirect(url_for("admin_login"))
 
 
+LOGIN_HTML = """
+    <h2>J Maslanka Estates – Admin</h2>
+    <div class="card" style="max-width:520px">
+      <form method="post">
+        <label>Username</label>
+        <input name="user" autocomplete="username" required />
+        <label>Password</label>
+        <input name="password" type="password" autocomplete="current-password" required />
+        <button type="submit" style="width:100%">Sign in</button>
+        {% if error %}<div class='err' style='margin-top:10px'>{{ error }}</div>{% endif %}
+      </form>
+      <p class="muted small" style="margin-top:10px">Tip: set <span class="kbd">ADMIN_PASSWORD</span> in your <span class="kbd">.env</span>.</p>
+    </div>
+"""
+_LOGIN_TMPL = app.jinja_env.from_string(LOGIN_HTML)
+
+
 @app.route("/admin/login", methods=["GET", "POST"])
 def admin_login():
     if admin_logged_in():
@@ -417,21 +759,7 @@ def admin_login():
             return redirect(url_for("admin_contacts"))
         error = "Invalid login."
 
-    body = f"""
-    <h2>J Maslanka Estates – Admin</h2>
-    <div class="card" style="max-width:520px">
-      <form method="post">
-        <label>Username</label>
-        <input name="user" autocomplete="username" required />
-        <label>Password</label>
-        <input name="password" type="password" autocomplete="current-password" required />
-        <button type="submit" style="width:100%">Sign in</button>
-        {"<div class='err' style='margin-top:10px'>" + error + "</div>" if error else ""}
-      </form>
-      <p class="muted small" style="margin-top:10px">Tip: set <span class="kbd">ADMIN_PASSWORD</span> in your <span class="kbd">.env</span>.</p>
-    </div>
-    """
-    return render_admin("Admin Login", body, show_nav=False)
+    return render_admin("Admin Login", _LOGIN_TMPL.render(error=error), show_nav=False)
 
 
 @app.route("/admin/logout")
@@ -443,27 +771,32 @@ def admin_logout():
 # -------------------------
 # Admin API
 # -------------------------
+def json_response(payload: Dict[str, Any], status: int = 200) -> Response:
+    # orjson encodes the small hot payloads (typeahead exists check) without the stdlib encoder
+    if orjson is None:
+        resp = jsonify(payload)
+        resp.status_code = status
+        return resp
+    return Response(orjson.dumps(payload), status=status, mimetype="application/json")
+
+
 @app.route("/admin/api/contacts/exists", methods=["GET"])
+@admin_required
 def admin_api_contacts_exists():
-    gate = require_admin()
-    if gate:
-        return gate
-
     raw_phone = request.args.get("phone") or ""
     phone = normalize_e164(raw_phone, DEFAULT_REGION)
     if not phone:
-        return jsonify({"ok": True, "valid": False, "exists": False})
+        return json_response({"ok": True, "valid": False, "exists": False})
 
-    c = get_contact_by_phone(phone)
-    return jsonify({"ok": True, "valid": True, "exists": bool(c), "name": (c or {}).get("name", ""), "id": (c or {}).get("id")})
+    hit = phone_exists_lite(phone)
+    if not hit:
+        return json_response({"ok": True, "valid": True, "exists": False, "name": "", "id": None})
+    return json_response({"ok": True, "valid": True, "exists": True, "name": hit[1] or "", "id": hit[0]})
 
 
 @app.route("/admin/api/contacts/<int:contact_id>", methods=["POST"])
+@admin_required
 def admin_api_update_contact(contact_id: int):
-    gate = require_admin()
-    if gate:
-        return gate
-
     payload = request.get_json(silent=True) or {}
     raw_phone = (payload.get("phone") or "").strip()
     raw_name = (payload.get("name") or "").strip()
@@ -471,43 +804,60 @@ def admin_api_update_contact(contact_id: int):
 
     phone = normalize_e164(raw_phone, DEFAULT_REGION)
     if not phone:
-        return jsonify({"ok": False, "error": "Invalid phone number."}), 400
+        return json_response({"ok": False, "error": "Invalid phone number."}, 400)
 
     name = clean_name(raw_name)
     opted_out = 1 if str(opted_out_raw).strip() in {"1", "true", "True"} else 0
 
     try:
         updated = update_contact_by_id(contact_id, phone, name, opted_out, actor=current_actor())
-        export_contacts_csv_and_optouts()
-        return jsonify({"ok": True, "contact": updated})
+        schedule_export()
+        return json_response({"ok": True, "contact": updated})
     except ValueError as e:
-        return jsonify({"ok": False, "error": str(e)}), 400
+        return json_response({"ok": False, "error": str(e)}, 400)
     except Exception:
-        return jsonify({"ok": False, "error": "Update failed."}), 500
+        return json_response({"ok": False, "error": "Update failed."}, 500)
 
 
 @app.route("/admin/api/contacts/<int:contact_id>/delete", methods=["POST"])
+@admin_required
 def admin_api_delete_contact(contact_id: int):
-    gate = require_admin()
-    if gate:
-        return gate
-
     ok = delete_contact_by_id(contact_id, actor=current_actor(), log=True)
     if ok:
-        export_contacts_csv_and_optouts()
-        return jsonify({"ok": True})
-    return jsonify({"ok": False, "error": "Contact not found."}), 404
+        schedule_export()
+        return json_response({"ok": True})
+    return json_response({"ok": False, "error": "Contact not found."}, 404)
 
 
 # -------------------------
 # Admin pages
 # -------------------------
+ADD_HTML = """
+    <h2>Admin – Add Contact</h2>
+    <div class="card" style="max-width:720px">
+      <form method="post" id="addForm">
+        <label>Phone number</label>
+        <input id="phoneInput" name="phone" placeholder="(412) 555-1234" required />
+        <div id="phoneLiveMsg" class="small muted" style="margin-top:2px"></div>
+
+        <label style="margin-top:10px">Name (optional)</label>
+        <input name="name" placeholder="Joey" />
+
+        <button id="addBtn" type="submit">Add</button>
+      </form>
+
+      {% if ok_msg %}<p class='ok'>{{ ok_msg }}</p>{% endif %}
+      {% if err_msg %}<p class='err'>{{ err_msg }}</p>{% endif %}
+
+      <p class="muted"><small>Saved to database and exported to contacts.csv automatically.</small></p>
+    </div>
+"""
+_ADD_TMPL = app.jinja_env.from_string(ADD_HTML)
+
+
 @app.route("/admin/add", methods=["GET", "POST"])
+@admin_required
 def admin_add():
-    gate = require_admin()
-    if gate:
-        return gate
-
     ok_msg = ""
     err_msg = ""
 
@@ -525,300 +875,100 @@ def admin_add():
             if not added:
                 err_msg = "Number already added."
             else:
-                export_contacts_csv_and_optouts()
+                schedule_export()
                 ok_msg = f"Added: {phone}" + (f" ({name})" if name else "")
 
-    # IMPORTANT: this block is NOT an f-string (JS has braces)
-    js_block = """
-    <script>
-      (function(){
-        const phoneInput = document.getElementById('phoneInput');
-        const msg = document.getElementById('phoneLiveMsg');
-        const btn = document.getElementById('addBtn');
-        let t = null;
-
-        function setState(text, isError){
-          msg.textContent = text || '';
-          msg.className = 'small ' + (isError ? 'err' : 'muted');
-        }
-
-        async function check(){
-          const v = (phoneInput.value || '').trim();
-          if(!v){ btn.disabled = false; setState('', false); return; }
-
-          try{
-            const res = await fetch('/admin/api/contacts/exists?phone=' + encodeURIComponent(v), {credentials:'same-origin'});
-            const data = await res.json();
-            if(!data.valid){
-              btn.disabled = true;
-              setState('Invalid number (include area code).', true);
-              return;
-            }
-            if(data.exists){
-              btn.disabled = true;
-              setState('Already exists' + (data.name ? (' (name: ' + data.name + ')') : '') + '.', true);
-              return;
-            }
-            btn.disabled = false;
-            setState('Looks good.', false);
-          }catch(e){
-            btn.disabled = false;
-            setState('', false);
-          }
-        }
-
-        phoneInput.addEventListener('input', ()=>{
-          clearTimeout(t);
-          t = setTimeout(check, 420);
-        });
-      })();
-    </script>
-    """
-
-    body = f"""
-    <h2>Admin – Add Contact</h2>
-    <div class="card" style="max-width:720px">
-      <form method="post" id="addForm">
-        <label>Phone number</label>
-        <input id="phoneInput" name="phone" placeholder="(412) 555-1234" required />
-        <div id="phoneLiveMsg" class="small muted" style="margin-top:2px"></div>
-
-        <label style="margin-top:10px">Name (optional)</label>
-        <input name="name" placeholder="Joey" />
-
-        <button id="addBtn" type="submit">Add</button>
-      </form>
-
-      {"<p class='ok'>" + ok_msg + "</p>" if ok_msg else ""}
-      {"<p class='err'>" + err_msg + "</p>" if err_msg else ""}
-
-      <p class="muted"><small>Saved to database and exported to contacts.csv automatically.</small></p>
-    </div>
-    {js_block}
-    """
+    body = _ADD_TMPL.render(ok_msg=ok_msg, err_msg=err_msg)
     return render_admin("Add Contact", body)
 
 
-@app.route("/admin/contacts", methods=["GET"])
-def admin_contacts():
-    gate = require_admin()
-    if gate:
-        return gate
-
-    q = request.args.get("q", "") or ""
-    contacts = list_contacts(q=q)
-
-    export_link = "/admin/contacts/export" + (f"?q={q}" if q else "")
-
-    rows_html = ""
-    for c in contacts:
-        cid = int(c["id"])
-        phone = c["phone"]
-        name = (c["name"] or "").strip().replace('"', "&quot;")
-        opted_out = int(c["opted_out"]) == 1
-        updated = c["updated_at"]
+CONTACTS_HTML = """
+    <h2>Admin – Contacts</h2>
 
-        pill = "<span class='pill out'>OPTED OUT</span>" if opted_out else "<span class='pill in'>OPTED IN</span>"
+    <div class="actionsTop">
+      <div class="left">
+        <form method="get" class="searchRow" style="margin:0">
+          <input name="q" placeholder="Search phone or name" value="{{ q }}" />
+          <button type="submit">Search</button>
+          <a href="/admin/contacts" class="muted" style="align-self:center">Clear</a>
+        </form>
+      </div>
+      <div class="right">
+        <a href="/admin/contacts/export{% if q %}?q={{ q|urlencode }}{% endif %}"><button type="button" class="btn2">Export CSV</button></a>
+      </div>
+    </div>
 
-        rows_html += f"""
-        <tr id="row-{cid}" data-id="{cid}">
+    <div class="card">
+      <p class="muted">Showing <strong>{{ contacts|length }}</strong> contact(s){% if q %} (filtered){% endif %}{% if page > 1 or has_next %}, page {{ page }}{% endif %}.</p>
+      <table>
+        <tr>
+          <th>Contact</th>
+          <th>Status</th>
+          <th>Actions</th>
+        </tr>
+        {% for c in contacts %}
+        {% set out = c.opted_out|int == 1 %}
+        <tr id="row-{{ c.id }}" data-id="{{ c.id }}">
           <td>
             <div class="inlineView">
-              <strong class="v-phone">{phone}</strong><br>
-              <span class="muted v-name">{name}</span>
+              <strong class="v-phone">{{ c.phone }}</strong><br>
+              <span class="muted v-name">{{ (c.name or "")|trim }}</span>
             </div>
             <div class="inlineField">
               <label class="small muted" style="display:block;margin-top:2px">Phone</label>
-              <input class="miniInput i-phone" value="{phone}" />
+              <input class="miniInput i-phone" value="{{ c.phone }}" />
               <label class="small muted" style="display:block;margin-top:8px">Name</label>
-              <input class="miniInput i-name" value="{name}" />
+              <input class="miniInput i-name" value="{{ (c.name or "")|trim }}" />
             </div>
           </td>
 
           <td>
             <div class="inlineView">
-              {pill}<br><span class="muted">Updated: <span class="v-updated">{updated}</span></span>
+              {% if out %}<span class='pill out'>OPTED OUT</span>{% else %}<span class='pill in'>OPTED IN</span>{% endif %}<br><span class="muted">Updated: <span class="v-updated">{{ c.updated_at }}</span></span>
             </div>
             <div class="inlineField">
               <label class="small muted" style="display:block;margin-top:2px">Status</label>
               <select class="miniSelect i-status">
-                <option value="0" {"selected" if not opted_out else ""}>OPTED IN</option>
-                <option value="1" {"selected" if opted_out else ""}>OPTED OUT</option>
+                <option value="0" {% if not out %}selected{% endif %}>OPTED IN</option>
+                <option value="1" {% if out %}selected{% endif %}>OPTED OUT</option>
               </select>
-              <div class="muted small" style="margin-top:8px">Updated: <span class="v-updated-2">{updated}</span></div>
+              <div class="muted small" style="margin-top:8px">Updated: <span class="v-updated-2">{{ c.updated_at }}</span></div>
             </div>
           </td>
 
           <td class="rowActions">
             <div class="inlineView">
-              <button type="button" class="btn2" onclick="startEdit({cid})">Edit</button>
-              <button type="button" class="btnDanger" onclick="openDeleteModal({cid})">Delete</button>
+              <button type="button" class="btn2" data-action="edit">Edit</button>
+              <button type="button" class="btnDanger" data-action="delete">Delete</button>
 
-              <form method="post" action="/admin/contacts/optin" style="margin-left:8px">
-                <input type="hidden" name="phone" value="{phone}">
+              <form method="post" action="/admin/contacts/optin" data-opt-out="0" style="margin-left:8px">
+                <input type="hidden" name="phone" value="{{ c.phone }}">
                 <button type="submit">Opt In</button>
               </form>
 
-              <form method="post" action="/admin/contacts/optout">
-                <input type="hidden" name="phone" value="{phone}">
+              <form method="post" action="/admin/contacts/optout" data-opt-out="1">
+                <input type="hidden" name="phone" value="{{ c.phone }}">
                 <button type="submit" class="btn2">Opt Out</button>
               </form>
             </div>
 
             <div class="inlineField">
-              <button type="button" onclick="saveEdit({cid})">Save</button>
-              <button type="button" class="btnGhost" onclick="cancelEdit({cid})">Cancel</button>
+              <button type="button" data-action="save">Save</button>
+              <button type="button" class="btnGhost" data-action="cancel">Cancel</button>
             </div>
           </td>
         </tr>
-        """
-
-    # IMPORTANT: NOT an f-string (JS braces)
-    js_block = """
-    <script>
-      let __deleteId = null;
-
-      function rowEl(id) {
-        return document.getElementById('row-' + id);
-      }
-
-      function startEdit(id) {
-        const r = rowEl(id);
-        if(!r) return;
-        r.classList.add('editing');
-      }
-
-      function cancelEdit(id) {
-        const r = rowEl(id);
-        if(!r) return;
-
-        r.querySelector('.i-phone').value = r.querySelector('.v-phone').textContent.trim();
-        r.querySelector('.i-name').value = r.querySelector('.v-name').textContent.trim();
-        const pillText = (r.querySelector('.inlineView .pill') || {textContent:''}).textContent || '';
-        r.querySelector('.i-status').value = pillText.includes('OUT') ? '1' : '0';
-
-        r.classList.remove('editing');
-      }
-
-      async function saveEdit(id) {
-        const r = rowEl(id);
-        if(!r) return;
-
-        const phone = (r.querySelector('.i-phone').value || '').trim();
-        const name = (r.querySelector('.i-name').value || '').trim();
-        const opted_out = (r.querySelector('.i-status').value || '0');
-
-        try {
-          const res = await fetch('/admin/api/contacts/' + id, {
-            method: 'POST',
-            headers: {'Content-Type':'application/json'},
-            credentials: 'same-origin',
-            body: JSON.stringify({phone, name, opted_out})
-          });
-          const data = await res.json();
-          if(!data.ok) {
-            showToast(data.error || 'Update failed.');
-            return;
-          }
-
-          r.querySelector('.v-phone').textContent = data.contact.phone;
-          r.querySelector('.v-name').textContent = data.contact.name || '';
-
-          const statusCell = r.children[1];
-          const pill = statusCell.querySelector('.inlineView .pill');
-          if(pill) {
-            const out = (parseInt(data.contact.opted_out) === 1);
-            pill.textContent = out ? 'OPTED OUT' : 'OPTED IN';
-            pill.className = 'pill ' + (out ? 'out' : 'in');
-          }
-
-          const upd = data.contact.updated_at || '';
-          const vUpdated = r.querySelector('.v-updated');
-          const vUpdated2 = r.querySelector('.v-updated-2');
-          if(vUpdated) vUpdated.textContent = upd;
-          if(vUpdated2) vUpdated2.textContent = upd;
-
-          r.classList.remove('editing');
-          showToast('Saved.');
-        } catch(e) {
-          showToast('Update failed.');
-        }
-      }
-
-      function openDeleteModal(id) {
-        const r = rowEl(id);
-        if(!r) return;
-        __deleteId = id;
-
-        const phone = (r.querySelector('.v-phone')?.textContent || '').trim();
-        const name = (r.querySelector('.v-name')?.textContent || '').trim();
-        const desc = document.getElementById('deleteDesc');
-        desc.textContent = 'Delete ' + (name ? (name + ' ') : '') + '(' + phone + ')? This cannot be undone.';
-
-        document.getElementById('modalOverlay').style.display = 'flex';
-      }
-
-      function closeDeleteModal() {
-        __deleteId = null;
-        document.getElementById('modalOverlay').style.display = 'none';
-      }
-
-      async function confirmDelete() {
-        if(__deleteId == null) return;
-        const id = __deleteId;
-
-        try {
-          const res = await fetch('/admin/api/contacts/' + id + '/delete', {
-            method: 'POST',
-            credentials: 'same-origin'
-          });
-          const data = await res.json();
-          if(!data.ok) {
-            showToast(data.error || 'Delete failed.');
-            return;
-          }
-          const r = rowEl(id);
-          if(r) r.remove();
-          closeDeleteModal();
-          showToast('Deleted.');
-        } catch(e) {
-          showToast('Delete failed.');
-        }
-      }
-
-      document.getElementById('modalOverlay').addEventListener('click', (e)=>{
-        if(e.target && e.target.id === 'modalOverlay') closeDeleteModal();
-      });
-    </script>
-    """
-
-    body = f"""
-    <h2>Admin – Contacts</h2>
-
-    <div class="actionsTop">
-      <div class="left">
-        <form method="get" class="searchRow" style="margin:0">
-          <input name="q" placeholder="Search phone or name" value="{q.replace('"', '&quot;')}" />
-          <button type="submit">Search</button>
-          <a href="/admin/contacts" class="muted" style="align-self:center">Clear</a>
-        </form>
-      </div>
-      <div class="right">
-        <a href="{export_link}"><button type="button" class="btn2">Export CSV</button></a>
-      </div>
-    </div>
-
-    <div class="card">
-      <p class="muted">Showing <strong>{len(contacts)}</strong> contact(s){(" (filtered)" if q else "")}.</p>
-      <table>
-        <tr>
-          <th>Contact</th>
-          <th>Status</th>
-          <th>Actions</th>
-        </tr>
-        {rows_html if rows_html else "<tr><td colspan='3'>No contacts found.</td></tr>"}
+        {% else %}
+        <tr><td colspan='3'>No contacts found.</td></tr>
+        {% endfor %}
       </table>
-      <p class="muted small" style="margin-top:12px">Tip: Inline edit updates the DB + exports files immediately.</p>
+      {% if page > 1 or has_next %}
+      <p class="small" style="margin-top:12px">
+        {% if page > 1 %}<a href="/admin/contacts?page={{ page - 1 }}&size={{ size }}{% if q %}&q={{ q|urlencode }}{% endif %}">&larr; Prev</a>{% endif %}
+        {% if has_next %}<a href="/admin/contacts?page={{ page + 1 }}&size={{ size }}{% if q %}&q={{ q|urlencode }}{% endif %}" style="margin-left:12px">Next &rarr;</a>{% endif %}
+      </p>
+      {% endif %}
+      <p class="muted small" style="margin-top:12px">Tip: Inline edits save to the DB immediately; the export files are refreshed shortly after.</p>
     </div>
 
     <div id="modalOverlay" class="modalOverlay" role="dialog" aria-modal="true">
@@ -831,96 +981,79 @@ def admin_contacts():
         </div>
       </div>
     </div>
+"""
+_CONTACTS_TMPL = app.jinja_env.from_string(CONTACTS_HTML)
 
-    {js_block}
-    """
+
+@app.route("/admin/contacts", methods=["GET"])
+@admin_required
+def admin_contacts():
+    q = request.args.get("q", "") or ""
+    page = max(request.args.get("page", 1, type=int), 1)
+    size = min(max(request.args.get("size", CONTACTS_PAGE_SIZE, type=int), 1), 1000)
+    # one extra row tells us whether there is a next page without a COUNT(*)
+    # sqlite3.Row straight into Jinja (c.phone falls back to c["phone"]); no per-row dict copy
+    contacts = list_contacts_iter(q=q, limit=size + 1, offset=(page - 1) * size).fetchall()
+    has_next = len(contacts) > size
+    del contacts[size:]
+
+    # compiled once at import; Jinja builds the rows in one pass and escapes values
+    body = _CONTACTS_TMPL.render(contacts=contacts, q=q, page=page, size=size, has_next=has_next)
     return render_admin("Contacts", body)
 
 
+CSV_CHUNK_CHARS = 64 * 1024
+
+
+def gzip_chunks(chunks: Iterator[str]) -> Iterator[bytes]:
+    # level 1: contact CSV is repetitive enough that the cheapest setting still shrinks it several-fold
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=1) as gz:
+        for chunk in chunks:
+            gz.write(chunk.encode("utf-8"))
+            if buf.tell() >= CSV_CHUNK_CHARS // 2:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+    yield buf.getvalue()  # closing the GzipFile writes the trailer
+
+
 @app.route("/admin/contacts/export", methods=["GET"])
+@admin_required
 def admin_contacts_export_csv():
-    gate = require_admin()
-    if gate:
-        return gate
-
     q = (request.args.get("q") or "").strip()
-    contacts = list_contacts(q=q)
-
-    def esc(v: Any) -> str:
-        s = "" if v is None else str(v)
-        s = s.replace('"', '""')
-        return f'"{s}"'
+    contacts = list_contacts_iter(q=q)
+    contacts.row_factory = None  # plain tuples; the CSV writer only needs positions
 
     def csv_lines():
-        yield "id,phone,name,opted_out,created_at,updated_at\n"
+        # C csv writer into a reusable buffer; QUOTE_ALL keeps the previous every-field-quoted format
+        buf = io.StringIO()
+        writer = csv.writer(buf, quoting=csv.QUOTE_ALL, lineterminator="\n")
+        buf.write("id,phone,name,opted_out,created_at,updated_at\n")
         for c in contacts:
-            yield ",".join(
-                [
-                    esc(c.get("id")),
-                    esc(c.get("phone")),
-                    esc(c.get("name")),
-                    esc(c.get("opted_out")),
-                    esc(c.get("created_at")),
-                    esc(c.get("updated_at")),
-                ]
-            ) + "\n"
+            writer.writerow(c)
+            # ~64 KB per yield: few large writes instead of one per row
+            if buf.tell() >= CSV_CHUNK_CHARS:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        yield buf.getvalue()
 
     filename = "contacts_export.csv" if not q else "contacts_export_filtered.csv"
     headers = {
         "Content-Type": "text/csv; charset=utf-8",
         "Content-Disposition": f'attachment; filename="{filename}"',
+        "Cache-Control": "no-store",
+        "X-Accel-Buffering": "no",  # let a fronting proxy pass chunks through as they come
+        "Vary": "Accept-Encoding",
     }
-    return Response(csv_lines(), headers=headers)
-
-
-@app.route("/admin/audit", methods=["GET"])
-def admin_audit():
-    gate = require_admin()
-    if gate:
-        return gate
+    if request.accept_encodings.quality("gzip") > 0:
+        headers["Content-Encoding"] = "gzip"
+        return Response(stream_with_context(gzip_chunks(csv_lines())), headers=headers)
+    return Response(stream_with_context(csv_lines()), headers=headers)
 
-    init_db()
-    with db() as conn:
-        rows = conn.execute(
-            """
-            SELECT id, actor, action, contact_id, before_json, after_json, ip, created_at
-            FROM audit_log
-            ORDER BY id DESC
-            LIMIT 250
-            """
-        ).fetchall()
 
-    def summarize(before_json: Optional[str], after_json: Optional[str]) -> str:
-        try:
-            before = json.loads(before_json) if before_json else None
-        except Exception:
-            before = None
-        try:
-            after = json.loads(after_json) if after_json else None
-        except Exception:
-            after = None
-
-        if after and not before:
-            return f"Created {after.get('phone','')}" + (f" ({after.get('name','')})" if (after.get("name") or "").strip() else "")
-        if before and not after:
-            return f"Deleted {before.get('phone','')}" + (f" ({before.get('name','')})" if (before.get("name") or "").strip() else "")
-        if before and after:
-            changes = []
-            for k in ["phone", "name", "opted_out"]:
-                if str(before.get(k)) != str(after.get(k)):
-                    changes.append(f"{k}: {before.get(k)} → {after.get(k)}")
-            return "; ".join(changes) if changes else "Updated"
-        return ""
-
-    rows_html = ""
-    for r in rows:
-        action = (r["action"] or "").upper()
-        actor = r["actor"] or ""
-        when = r["created_at"] or ""
-        ip = r["ip"] or ""
-        summary = summarize(r["before_json"], r["after_json"])
-        pill_class = "out" if ("DELETE" in action or "OUT" in action) else "in"
-        rows_html += f"""
+_AUDIT_ROW_TMPL = """
         <tr>
           <td><strong>{when}</strong><br><span class="muted small">{ip}</span></td>
           <td><strong>{actor}</strong></td>
@@ -929,10 +1062,69 @@ def admin_audit():
         </tr>
         """
 
+
+AUDIT_PAGE_ROWS = 250
+_MAX_ROWID = (1 << 63) - 1
+_STREAM_MARK = "<!--stream-rows-->"
+
+
+@functools.lru_cache(maxsize=1024)
+def summarize_audit(before_json: Optional[str], after_json: Optional[str]) -> str:
+    # only for rows written before audit_log.summary existed
+    # identical payloads (no-op writes) can't differ in any field; skip both parses
+    if before_json == after_json:
+        return "Updated" if before_json else ""
+    try:
+        before = _json_loads(before_json) if before_json else None
+    except Exception:
+        before = None
+    try:
+        after = _json_loads(after_json) if after_json else None
+    except Exception:
+        after = None
+    return summarize_change(before, after)
+
+
+@app.route("/admin/audit", methods=["GET"])
+@admin_required
+def admin_audit():
+    # keyset paging on the rowid: each page is a seek + LIMIT, however deep you go
+    before_id = request.args.get("before_id", type=int)
+    before = before_id or _MAX_ROWID
+    conn = db()
+    shown, last_id = conn.execute(
+        "SELECT count(*), min(id) FROM (SELECT id FROM audit_log WHERE id < ? ORDER BY id DESC LIMIT ?)",
+        (before, AUDIT_PAGE_ROWS),
+    ).fetchone()
+    has_older = bool(last_id) and conn.execute(
+        "SELECT 1 FROM audit_log WHERE id < ? LIMIT 1", (last_id,)
+    ).fetchone() is not None
+    rows = conn.execute(
+        """
+        SELECT id, actor, upper(coalesce(action, '')) AS action, contact_id, before_json, after_json, ip, created_at, summary,
+               CASE WHEN upper(action) LIKE '%DELETE%' OR upper(action) LIKE '%OUT%'
+                    THEN 'out' ELSE 'in' END AS pill_class
+        FROM audit_log
+        WHERE id < ?
+        ORDER BY id DESC
+        LIMIT ?
+        """,
+        (before, AUDIT_PAGE_ROWS),
+    )
+
+    pager = ""
+    if before_id or has_older:
+        pager = (
+            '<p class="small" style="margin-top:12px">'
+            + ('<a href="/admin/audit">&larr; Newest</a>' if before_id else "")
+            + (f'<a href="/admin/audit?before_id={last_id}" style="margin-left:12px">Older &rarr;</a>' if has_older else "")
+            + "</p>"
+        )
+
     body = f"""
     <h2>Admin – Audit Log</h2>
     <div class="card">
-      <p class="muted">Latest <strong>{len(rows)}</strong> actions.</p>
+      <p class="muted">{"Older" if before_id else "Latest"} <strong>{shown}</strong> actions.</p>
       <table>
         <tr>
           <th>Time</th>
@@ -940,100 +1132,142 @@ def admin_audit():
           <th>Action</th>
           <th>Details</th>
         </tr>
-        {rows_html if rows_html else "<tr><td colspan='4'>No audit entries yet.</td></tr>"}
+        {_STREAM_MARK}
       </table>
+      {pager}
       <p class="muted small" style="margin-top:12px">
         Actions include create/update/delete/opt in/opt out from the admin panel and SMS actions as actor <span class="kbd">system</span>.
       </p>
     </div>
     """
-    return render_admin("Audit Log", body)
+    # the page shell renders once; rows stream into the gap straight off the cursor
+    head, tail = render_admin("Audit Log", body).split(_STREAM_MARK, 1)
+
+    def generate():
+        yield head
+        if not shown:
+            yield "<tr><td colspan='4'>No audit entries yet.</td></tr>"
+        for r in rows:
+            # action is uppercased and pill_class derived in the SELECT
+            yield _AUDIT_ROW_TMPL.format(
+                when=esc(r["created_at"] or ""), ip=esc(r["ip"] or ""), actor=esc(r["actor"] or ""),
+                pill_class=r["pill_class"], action=esc(r["action"]),
+                summary=esc(
+                    r["summary"] if r["summary"] is not None else summarize_audit(r["before_json"], r["after_json"])
+                ),
+            )
+        yield tail
+
+    return Response(stream_with_context(generate()), mimetype="text/html")
+
+
+def wants_no_content() -> bool:
+    # admin.js posts the toggles with fetch and patches the row itself; plain form posts still get the redirect
+    return request.headers.get("X-Requested-With") == "XMLHttpRequest"
+
+
+_NO_STORE_ENDPOINTS = frozenset({"admin_contacts_optout", "admin_contacts_optin"})
+
+
+@app.after_request
+def _no_store_toggles(resp: Response) -> Response:
+    if request.endpoint in _NO_STORE_ENDPOINTS:
+        resp.headers["Cache-Control"] = "no-store"
+    return resp
 
 
 @app.route("/admin/contacts/optout", methods=["POST"])
+@admin_required
 def admin_contacts_optout():
-    gate = require_admin()
-    if gate:
-        return gate
-
     phone = request.form.get("phone") or ""
     phone = normalize_e164(phone, DEFAULT_REGION) or phone
     if phone:
         set_opted_out(phone, 1, actor=current_actor(), log=True)
-        export_contacts_csv_and_optouts()
+        schedule_export()
+    if wants_no_content():
+        return "", 204
     return redirect(url_for("admin_contacts"))
 
 
 @app.route("/admin/contacts/optin", methods=["POST"])
+@admin_required
 def admin_contacts_optin():
-    gate = require_admin()
-    if gate:
-        return gate
-
     phone = request.form.get("phone") or ""
     phone = normalize_e164(phone, DEFAULT_REGION) or phone
     if phone:
         set_opted_out(phone, 0, actor=current_actor(), log=True)
-        export_contacts_csv_and_optouts()
+        schedule_export()
+    if wants_no_content():
+        return "", 204
     return redirect(url_for("admin_contacts"))
 
 
 # -------------------------
 # Twilio Webhook (/sms)
 # -------------------------
+def _twiml(text: str) -> str:
+    resp = MessagingResponse()
+    resp.message(text)
+    return str(resp)
+
+
+# canned replies never change; serialize and UTF-8 encode their TwiML once at import
+_XML_HEADERS = {"Content-Type": "application/xml"}
+_XML_INVALID = _twiml("Invalid number. Reply JOIN to subscribe. Reply STOP to opt out.").encode("utf-8")
+_XML_OPTED_OUT = _twiml("You’re opted out. Reply START to resubscribe.").encode("utf-8")
+_XML_HELP = _twiml("Reply JOIN to subscribe. Reply STOP to opt out.").encode("utf-8")
+_XML_SUBSCRIBED = _twiml("You’re subscribed! Reply STOP to opt out.").encode("utf-8")
+_XML_SUBSCRIBED_ASK_NAME = _twiml(
+    "You’re subscribed! Reply with your first name (example: Joey). Reply STOP to opt out."
+).encode("utf-8")
+
+
 @app.route("/sms", methods=["POST"])
 def inbound_sms():
-    init_db()
-
     from_number = request.form.get("From", "")
     body = (request.form.get("Body") or "").strip()
     toks = tokens_upper(body)
+    kw = min((KEYWORD_ACTION[t] for t in toks if t in KEYWORD_ACTION), default=None)
 
     phone = normalize_e164(from_number, DEFAULT_REGION)
 
-    resp = MessagingResponse()
     if not phone:
-        resp.message("Invalid number. Reply JOIN to subscribe. Reply STOP to opt out.")
-        return str(resp), 200, {"Content-Type": "application/xml"}
+        return _XML_INVALID, 200, _XML_HEADERS
 
-    c = get_contact_by_phone(phone)
+    if kw == KW_OPTOUT:
+        upsert_opt_status(phone, 1, actor="system")
+        schedule_export()
+        return _XML_OPTED_OUT, 200, _XML_HEADERS
 
-    if toks & OPTOUT_KEYWORDS:
-        if not c:
-            add_contact(phone, "", actor="system", log=True)
-        set_opted_out(phone, 1, actor="system", log=True)
-        export_contacts_csv_and_optouts()
-        resp.message("You’re opted out. Reply START to resubscribe.")
-        return str(resp), 200, {"Content-Type": "application/xml"}
+    if kw == KW_HELP:
+        return _XML_HELP, 200, _XML_HEADERS
 
-    if toks & HELP_KEYWORDS:
-        resp.message("Reply JOIN to subscribe. Reply STOP to opt out.")
-        return str(resp), 200, {"Content-Type": "application/xml"}
+    if kw == KW_OPTIN:
+        after = upsert_opt_status(phone, 0, actor="system")
+        schedule_export()
+        if ASK_NAME_ON_JOIN and not (after["name"] or "").strip():
+            return _XML_SUBSCRIBED_ASK_NAME, 200, _XML_HEADERS
+        return _XML_SUBSCRIBED, 200, _XML_HEADERS
 
-    if toks & OPTIN_KEYWORDS:
-        if not c:
-            add_contact(phone, "", actor="system", log=True)
-        set_opted_out(phone, 0, actor="system", log=True)
-        export_contacts_csv_and_optouts()
-        if ASK_NAME_ON_JOIN and (not c or not (c.get("name") or "").strip()):
-            resp.message("You’re subscribed! Reply with your first name (example: Joey). Reply STOP to opt out.")
-        else:
-            resp.message("You’re subscribed! Reply STOP to opt out.")
-        return str(resp), 200, {"Content-Type": "application/xml"}
+    c = get_contact_by_phone(phone)
 
     # If opted in and name empty, treat message as name
     if c and int(c["opted_out"]) == 0 and ASK_NAME_ON_JOIN and not (c["name"] or "").strip():
         name = clean_name(body)
         if name:
-            before = get_contact_by_phone(phone)
-            with db() as conn:
-                conn.execute("UPDATE contacts SET name=?, updated_at=? WHERE phone=?", (name, utc_now(), phone))
-            after = get_contact_by_phone(phone)
-            if after:
-                audit_log("system", "update", after.get("id"), before, after)
-            export_contacts_csv_and_optouts()
-            resp.message(f"Thanks, {name}! You’re all set. Reply STOP to opt out.")
-            return str(resp), 200, {"Content-Type": "application/xml"}
-
-    resp.message("Reply JOIN to subscribe. Reply STOP to opt out.")
-    return str(resp), 200, {"Content-Type": "application/xml"}
+            # c (loaded above) is the audit "before"; RETURNING gives "after" in the same statement
+            with tx() as conn:
+                row = conn.execute(
+                    """
+                    UPDATE contacts SET name=?, updated_at=? WHERE phone=?
+                    RETURNING id, phone, name, opted_out, created_at, updated_at
+                    """,
+                    (name, utc_now(), phone),
+                ).fetchone()
+                if row:
+                    audit_log("system", "update", row["id"], c, dict(row), conn=conn)
+            bump_contacts_version(phone)
+            schedule_export()
+            return _twiml(f"Thanks, {name}! You’re all set. Reply STOP to opt out."), 200, _XML_HEADERS
+
+    return _XML_HELP, 200, _XML_HEADERS
@@ -0,0 +1,213 @@
+// Shared admin UI script: loaded on every admin page, each section guards on its own elements.
+
+function showToast(msg){
+  const t = document.getElementById('toast');
+  if(!t) return;
+  t.textContent = msg;
+  t.style.display='block';
+  clearTimeout(window.__toastTimer);
+  window.__toastTimer = setTimeout(()=>{ t.style.display='none'; }, 2400);
+}
+
+// Contacts page: inline edit + delete modal
+let __deleteId = null;
+
+function rowEl(id) {
+  return document.getElementById('row-' + id);
+}
+
+function startEdit(id) {
+  const r = rowEl(id);
+  if(!r) return;
+  r.classList.add('editing');
+}
+
+function cancelEdit(id) {
+  const r = rowEl(id);
+  if(!r) return;
+
+  r.querySelector('.i-phone').value = r.querySelector('.v-phone').textContent.trim();
+  r.querySelector('.i-name').value = r.querySelector('.v-name').textContent.trim();
+  const pillText = (r.querySelector('.inlineView .pill') || {textContent:''}).textContent || '';
+  r.querySelector('.i-status').value = pillText.includes('OUT') ? '1' : '0';
+
+  r.classList.remove('editing');
+}
+
+async function saveEdit(id) {
+  const r = rowEl(id);
+  if(!r) return;
+
+  const phone = (r.querySelector('.i-phone').value || '').trim();
+  const name = (r.querySelector('.i-name').value || '').trim();
+  const opted_out = (r.querySelector('.i-status').value || '0');
+
+  try {
+    const res = await fetch('/admin/api/contacts/' + id, {
+      method: 'POST',
+      headers: {'Content-Type':'application/json'},
+      credentials: 'same-origin',
+      body: JSON.stringify({phone, name, opted_out})
+    });
+    const data = await res.json();
+    if(!data.ok) {
+      showToast(data.error || 'Update failed.');
+      return;
+    }
+
+    r.querySelector('.v-phone').textContent = data.contact.phone;
+    r.querySelector('.v-name').textContent = data.contact.name || '';
+
+    const statusCell = r.children[1];
+    const pill = statusCell.querySelector('.inlineView .pill');
+    if(pill) {
+      const out = (parseInt(data.contact.opted_out) === 1);
+      pill.textContent = out ? 'OPTED OUT' : 'OPTED IN';
+      pill.className = 'pill ' + (out ? 'out' : 'in');
+    }
+
+    const upd = data.contact.updated_at || '';
+    const vUpdated = r.querySelector('.v-updated');
+    const vUpdated2 = r.querySelector('.v-updated-2');
+    if(vUpdated) vUpdated.textContent = upd;
+    if(vUpdated2) vUpdated2.textContent = upd;
+
+    r.classList.remove('editing');
+    showToast('Saved.');
+  } catch(e) {
+    showToast('Update failed.');
+  }
+}
+
+function openDeleteModal(id) {
+  const r = rowEl(id);
+  if(!r) return;
+  __deleteId = id;
+
+  const phone = (r.querySelector('.v-phone')?.textContent || '').trim();
+  const name = (r.querySelector('.v-name')?.textContent || '').trim();
+  const desc = document.getElementById('deleteDesc');
+  desc.textContent = 'Delete ' + (name ? (name + ' ') : '') + '(' + phone + ')? This cannot be undone.';
+
+  document.getElementById('modalOverlay').style.display = 'flex';
+}
+
+function closeDeleteModal() {
+  __deleteId = null;
+  document.getElementById('modalOverlay').style.display = 'none';
+}
+
+async function confirmDelete() {
+  if(__deleteId == null) return;
+  const id = __deleteId;
+
+  try {
+    const res = await fetch('/admin/api/contacts/' + id + '/delete', {
+      method: 'POST',
+      credentials: 'same-origin'
+    });
+    const data = await res.json();
+    if(!data.ok) {
+      showToast(data.error || 'Delete failed.');
+      return;
+    }
+    const r = rowEl(id);
+    if(r) r.remove();
+    closeDeleteModal();
+    showToast('Deleted.');
+  } catch(e) {
+    showToast('Delete failed.');
+  }
+}
+
+// one delegated listener for every row button; the row's data-id says which contact
+const ROW_ACTIONS = {edit: startEdit, cancel: cancelEdit, save: saveEdit, delete: openDeleteModal};
+document.addEventListener('click', (e)=>{
+  const btn = e.target.closest('[data-action]');
+  const row = btn && btn.closest('tr[data-id]');
+  const fn = btn && ROW_ACTIONS[btn.dataset.action];
+  if(!row || !fn) return;
+  fn(parseInt(row.dataset.id, 10));
+});
+
+// Opt In / Opt Out: post in the background and flip the row's pill instead of reloading the page;
+// without JS (or if the request fails) the forms still submit normally
+document.addEventListener('submit', async (e)=>{
+  const form = e.target.closest('form[data-opt-out]');
+  const row = form && form.closest('tr[data-id]');
+  if(!row) return;
+  e.preventDefault();
+
+  try {
+    const res = await fetch(form.action, {
+      method: 'POST',
+      headers: {'X-Requested-With': 'XMLHttpRequest'},
+      credentials: 'same-origin',
+      body: new FormData(form)
+    });
+    if(res.status !== 204) throw new Error('unexpected status ' + res.status);
+  } catch(err) {
+    form.submit();
+    return;
+  }
+
+  const out = form.dataset.optOut === '1';
+  const pill = row.querySelector('.inlineView .pill');
+  if(pill) {
+    pill.textContent = out ? 'OPTED OUT' : 'OPTED IN';
+    pill.className = 'pill ' + (out ? 'out' : 'in');
+  }
+  row.querySelector('.i-status').value = out ? '1' : '0';
+  showToast(out ? 'Opted out.' : 'Opted in.');
+});
+
+const overlay = document.getElementById('modalOverlay');
+if(overlay) {
+  overlay.addEventListener('click', (e)=>{
+    if(e.target && e.target.id === 'modalOverlay') closeDeleteModal();
+  });
+}
+
+// Add Contact page: live duplicate/validity check
+(function(){
+  const phoneInput = document.getElementById('phoneInput');
+  const msg = document.getElementById('phoneLiveMsg');
+  const btn = document.getElementById('addBtn');
+  if(!phoneInput) return;  // only the Add Contact page has the live check
+  let t = null;
+
+  function setState(text, isError){
+    msg.textContent = text || '';
+    msg.className = 'small ' + (isError ? 'err' : 'muted');
+  }
+
+  async function check(){
+    const v = (phoneInput.value || '').trim();
+    if(!v){ btn.disabled = false; setState('', false); return; }
+
+    try{
+      const res = await fetch('/admin/api/contacts/exists?phone=' + encodeURIComponent(v), {credentials:'same-origin'});
+      const data = await res.json();
+      if(!data.valid){
+        btn.disabled = true;
+        setState('Invalid number (include area code).', true);
+        return;
+      }
+      if(data.exists){
+        btn.disabled = true;
+        setState('Already exists' + (data.name ? (' (name: ' + data.name + ')') : '') + '.', true);
+        return;
+      }
+      btn.disabled = false;
+      setState('Looks good.', false);
+    }catch(e){
+      btn.disabled = false;
+      setState('', false);
+    }
+  }
+
+  phoneInput.addEventListener('input', ()=>{
+    clearTimeout(t);
+    t = setTimeout(check, 420);
+  });
+})();